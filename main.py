@@ -1,8 +1,12 @@
-import inspect
-from io import StringIO
-import re
+from io import BytesIO, StringIO
 import json
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import panel as pn
 
 from src import logic
@@ -12,39 +16,93 @@ from src.ui import ViewResult, ViewResultPreMixture
 
 pn.extension('tabulator', 'floatpanel', 'katex', 'mathjax', 'gridstack')
 
+_LOGIC_CLASSES = tuple(v for v in vars(logic).values() if isinstance(v, type))
+_DIGITS = '0123456789'
+# Every Arrow IPC stream message starts with this continuation marker.
+_ARROW_MAGIC = b'\xff\xff\xff\xff'
+
 
 def list_logic_obj():
-    logic_classes = tuple(
-        cls for name, cls in inspect.getmembers(logic, inspect.isclass)
+    return _LOGIC_OBJECTS
+
+
+def to_payload(data: pd.DataFrame) -> dict:
+    """Convert a table into a JSON-serializable dict of columns and rows."""
+    # NaN is not valid JSON, so write it as `null`.
+    return (
+        data.astype(object)
+        .where(data.notna(), None)
+        .to_dict(orient='split', index=False)
     )
-    logic_objects = [
-        obj for obj in globals().values()
-        if isinstance(obj, logic_classes)
-    ]
-    return logic_objects
 
 
 def save():
     logic_objects = list_logic_obj()
-    f = ',\n'.join(
-        ['"' + obj.name + '": ' + obj.data.to_json() for obj in logic_objects]
-    )
-    f = '{\n    ' + f + '\n}'
-    f = StringIO(f)
+    payload = {obj.name: to_payload(obj.data) for obj in logic_objects}
+    f = StringIO()
+    json.dump(payload, f, separators=(',', ':'))
+    f.seek(0)
+    return f
+
+
+def save_arrow():
+    """Save every table as Arrow IPC streams written back to back.
+
+    Each stream carries the object name in its schema metadata.
+    """
+    f = BytesIO()
+    for obj in list_logic_obj():
+        table = pa.Table.from_pandas(obj.data, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, b'name': obj.name.encode()}
+        )
+        with pa.ipc.new_stream(f, table.schema) as writer:
+            writer.write_table(table)
     f.seek(0)
     return f
 
 
+def to_frame(payload: dict) -> pd.DataFrame:
+    """Build a table from the dict written by `save()`."""
+    if payload.keys() == {'columns', 'data'}:
+        data = pd.DataFrame(**payload)
+    else:
+        # Column-oriented notebooks written by older versions.
+        data = pd.DataFrame.from_dict(payload).reset_index(drop=True)
+    # JSON `null` is decoded as None, so put NaN back to keep numeric dtypes.
+    return data.astype(object).where(data.notna(), np.nan).infer_objects()
+
+
+def load_arrow(value: bytes) -> dict[str, pd.DataFrame]:
+    """Read the tables from the streams written by `save_arrow()`."""
+    source = pa.BufferReader(value)
+    values = {}
+    while source.tell() < source.size():
+        table = pa.ipc.open_stream(source).read_all()
+        values[table.schema.metadata[b'name'].decode()] = table.to_pandas()
+    return values
+
+
 def load(value):
     if not value:
         return
-    values = json.loads(value)
-    pat = r'(?P<class>[^\d]+)\d+'
-    values = {re.match(pat, key).group('class'): value for key, value in values.items()}
-    logic_objects = list_logic_obj()
-    for obj in logic_objects:
-        cls = re.match(pat, obj.name).group('class')
-        obj.data = pd.read_json(StringIO(json.dumps(values[cls])))
+    if value[:len(_ARROW_MAGIC)] == _ARROW_MAGIC:
+        values = load_arrow(value)
+    else:
+        # Notebooks saved as JSON.
+        values = {
+            key: to_frame(payload) for key, payload in _json.loads(value).items()
+        }
+    # Tables unknown to this version, e.g. from another layout, are skipped.
+    loaded = [
+        (_LOGIC_OBJECTS_BY_CLASS[name], data)
+        for key, data in values.items()
+        if (name := key.rstrip(_DIGITS)) in _LOGIC_OBJECTS_BY_CLASS
+    ]
+    for obj, data in loaded:
+        # Setting `data` recalculates every dependent table.
+        if not data.equals(obj.data):
+            obj.data = data
 
 
 def debugger(event):
@@ -63,41 +121,12 @@ work = logic.Work(weight=weight)
 workpremixture = logic.WorkPreMixture(weight=weightpremixture)
 result = logic.Result(work=work)
 result_premixture = logic.ResultPreMixture(workpremixture)
+_LOGIC_OBJECTS = [
+    obj for obj in globals().values() if isinstance(obj, _LOGIC_CLASSES)
+]
+_LOGIC_OBJECTS_BY_CLASS = {obj.name.rstrip(_DIGITS): obj for obj in _LOGIC_OBJECTS}
 
-table_material = ViewSourceMaterial(data=material, floating=FLOATING, align='center')
-# CANNOT align Tabulator although table_material can do it.
-table_composition = ViewComposition(
-    data=composition, title='02. Composition', floating=FLOATING, align='center'
-)
-table_premixture = ViewPremixture(data=premixture, title='03. PreMixture', floating=FLOATING, align='center')
-table_weight = ViewWeight(data=weight, title='04. Target Weight', floating=FLOATING)
-table_weight_premixture = ViewWeightPreMixture(
-    data=weightpremixture, title='05. Target PreMixture', floating=FLOATING
-)
-table_work = ViewWork(data=work, title='06. Log Weight', floating=FLOATING)
-table_work_premixture = ViewWorkPreMixture(
-    data=workpremixture, title='07. Log PreMixture', floating=FLOATING
-)
-table_result = ViewResult(data=result, title='08. Result Composition', floating=FLOATING)
-table_result_premixture = ViewResultPreMixture(
-    data=result_premixture, title='09. Result PreMixture', floating=FLOATING
-)
-
-btn_debug = pn.widgets.Button(name='debugger', button_type='danger')
-pn.bind(debugger, btn_debug, watch=True)
-
-btn_save = pn.widgets.FileDownload(callback=save, filename='notebook.json')
-btn_load = pn.widgets.FileInput(accept='.json', mime_type='text/json')
-_ = pn.bind(load, btn_load.param.value, watch=True)
-
-pn.Row(btn_debug, btn_save, btn_load).servable()
-#gstack = pn.layout.gridstack.GridStack(mode='override', allow_drag=True, allow_resize=True)
-gstack = pn.GridSpec(sizing_mode='stretch_both', max_height=800)
-gstack[0, 0] = table_material
-gstack[0, 1] = table_composition
-gstack[0, 2] = table_premixture
-gstack[1, 0] = table_weight
-arrow_svg = """
+ARROW_SVG = """
 <svg width="100%" height="100%" viewBox="0 0 100 100" preserveAspectRatio="none">
   <defs>
     <marker id="arrowhead" markerWidth="10" markerHeight="7" refX="0" refY="3.5" orient="auto" markerUnits="strokeWidth">
@@ -107,12 +136,51 @@ arrow_svg = """
   <line x1="95" y1="50" x2="15" y2="50" stroke="#000" stroke-width="2" marker-end="url(#arrowhead)" />
 </svg>
 """
-pane_svg = pn.pane.HTML(arrow_svg, width=None, height=None)
-gstack[1, 1] = pane_svg
-gstack[1, 2] = table_weight_premixture
-gstack[2, 0] = table_work
-gstack[2, 2] = table_work_premixture
-gstack[3, 0] = table_result
-gstack[3, 2] = table_result_premixture
-
-gstack.servable()
\ No newline at end of file
+
+
+def build_layout(floating: bool) -> pn.GridSpec:
+    """Arrange the views of the logic objects on a grid."""
+    table_material = ViewSourceMaterial(data=material, floating=floating, align='center')
+    # CANNOT align Tabulator although table_material can do it.
+    table_composition = ViewComposition(
+        data=composition, title='02. Composition', floating=floating, align='center'
+    )
+    table_premixture = ViewPremixture(data=premixture, title='03. PreMixture', floating=floating, align='center')
+    table_weight = ViewWeight(data=weight, title='04. Target Weight', floating=floating)
+    table_weight_premixture = ViewWeightPreMixture(
+        data=weightpremixture, title='05. Target PreMixture', floating=floating
+    )
+    table_work = ViewWork(data=work, title='06. Log Weight', floating=floating)
+    table_work_premixture = ViewWorkPreMixture(
+        data=workpremixture, title='07. Log PreMixture', floating=floating
+    )
+    table_result = ViewResult(data=result, title='08. Result Composition', floating=floating)
+    table_result_premixture = ViewResultPreMixture(
+        data=result_premixture, title='09. Result PreMixture', floating=floating
+    )
+
+    #gstack = pn.layout.gridstack.GridStack(mode='override', allow_drag=True, allow_resize=True)
+    gstack = pn.GridSpec(sizing_mode='stretch_both', max_height=800)
+    gstack[0, 0] = table_material
+    gstack[0, 1] = table_composition
+    gstack[0, 2] = table_premixture
+    gstack[1, 0] = table_weight
+    gstack[1, 1] = pn.pane.HTML(ARROW_SVG, width=None, height=None)
+    gstack[1, 2] = table_weight_premixture
+    gstack[2, 0] = table_work
+    gstack[2, 2] = table_work_premixture
+    gstack[3, 0] = table_result
+    gstack[3, 2] = table_result_premixture
+    return gstack
+
+
+btn_debug = pn.widgets.Button(name='debugger', button_type='danger')
+pn.bind(debugger, btn_debug, watch=True)
+
+btn_save = pn.widgets.FileDownload(callback=save_arrow, filename='notebook.arrow')
+btn_save_json = pn.widgets.FileDownload(callback=save, filename='notebook.json')
+btn_load = pn.widgets.FileInput(accept='.arrow,.json')
+_ = pn.bind(load, btn_load.param.value, watch=True)
+
+pn.Row(btn_debug, btn_save, btn_save_json, btn_load).servable()
+build_layout(FLOATING).servable()
@@ -1,12 +1,46 @@
+from itertools import chain, count, islice, product
+from string import ascii_lowercase, ascii_uppercase
 from typing import List, Optional, Literal, cast
 import numpy as np
 import pandas as pd
 import param
 
 
+# Row labels: A-Z followed by AA-ZZ.
+_UPPER = [*ascii_uppercase, *map(''.join, product(ascii_uppercase, repeat=2))]
+_LOWER = [*ascii_lowercase, *map(''.join, product(ascii_lowercase, repeat=2))]
+
+
+def _labels(labels: list[str], start: int, stop: int) -> list[str]:
+    """Row labels from `start` to `stop`.
+
+    Labels past ZZ continue as AAA, AAB, ... and are made on demand.
+
+    Parameters
+    ----------
+    labels: list of str
+        `_UPPER` or `_LOWER`.
+    start: int
+        Index of the first row.
+    stop: int
+        Index after the last row.
+    """
+    if stop <= len(labels):
+        return labels[start:stop]
+    longer = map(''.join, chain.from_iterable(
+        product(labels[:26], repeat=n) for n in count(3)
+    ))
+    return labels[start:] + list(islice(
+        longer, max(start-len(labels), 0), stop-len(labels)
+    ))
+
+
 
 class SourceMaterial(param.Parameterized):
     """Manage Source Materials.
+
+    Set several parameters with `param.update(data=..., nrows=...)`
+    to call each dependent method once.
     
     Attributes
     -----------
@@ -18,15 +52,21 @@ class SourceMaterial(param.Parameterized):
         Column names.
     names: list
         Material names.
+    name_tuple: tuple
+        `names` as a tuple.
     unit: str
         Calcuration unit. "wt%" or "mM".
     weight_percent: pd.DataFrame
         `data` in wt%.
+    wt_series: pd.Series
+        wt% indexed by material names.
     """
     data = param.DataFrame(allow_None=True, allow_refs=True)
     nrows = param.Integer(default=3, step=1, bounds=(1, None))
     names = param.List(allow_None=True)
     unit = param.String()
+    _weight_percent = param.DataFrame(allow_None=True)
+    _wt_series = param.Series(allow_None=True)
 
     def __init__(
             self,
@@ -42,12 +82,22 @@ class SourceMaterial(param.Parameterized):
         super().__init__(data=data, nrows=nrows, names=None, unit=unit, **params)
 
     def make_row(self, i) -> list:
-        row = (
-            [f'Material {chr(ord("A")+i)}']
-            + [None]*(len(self.columns)-2)
-            + [100]
-        )
-        return row
+        return self.make_rows(i, i+1)[0]
+
+    def make_rows(self, start: int, stop: int) -> list[list]:
+        """Default rows from `start` to `stop`, sharing the empty cells."""
+        mid = [np.nan]*(len(self.columns)-2)
+        return [[f'Material {label}', *mid, 100.] for label in _labels(_UPPER, start, stop)]
+
+    def make_dtypes(self) -> dict[str, str]:
+        """dtype of each column except the material names.
+
+        `Lot` is text and the others are numbers, with NaN for empty cells.
+        """
+        return {
+            col: 'string' if col == 'Lot' else 'float64'
+            for col in self.columns[1:]
+        }
 
     def make_column(self, columns, unit) -> list:
         if columns is None:
@@ -65,58 +115,121 @@ class SourceMaterial(param.Parameterized):
             columns += ['g/mol']
         return columns
 
+    @param.depends('data', 'unit', watch=True, on_init=True)
+    def clear_weight_percent(self):
+        """Discard `weight_percent` calculated from the previous data."""
+        self._weight_percent = None
+        self._wt_series = None
+
+    @param.depends('unit', watch=True, on_init=True)
+    def update_unit(self):
+        """Select how `weight_percent` is calculated for `unit`."""
+        match self.unit:
+            case 'wt%':
+                self._calc_weight_percent = self.calc_weight_percent_wt
+            case 'mM':
+                self._calc_weight_percent = self.calc_weight_percent_mM
+            case _:
+                raise ValueError(f"`unit` = {self.unit} is not supported.")
+
     @param.depends('nrows', watch=True, on_init=True)
     def resize_table(self):
         nrows = cast(int, self.nrows)
         data = cast(pd.DataFrame, self.data)
         if self.data is None:
+            columns = self.columns
             self.data = pd.DataFrame(
-                [self.make_row(i) for i in range(nrows)],
-                columns=self.columns,
-            )
+                {columns[0]: [f'Material {label}' for label in _labels(_UPPER, 0, nrows)]}
+                | {col: np.full(nrows, np.nan) for col in columns[1:-1]}
+                | {columns[-1]: np.full(nrows, 100.)}
+            ).astype(self.make_dtypes())
+        elif nrows <= data.shape[0]:
+            self.data = data.iloc[:nrows].reset_index(drop=True)
         else:
-            data = [
-                data.iloc[i].to_list() if i<self.data.shape[0]
-                else self.make_row(i) for i in range(nrows)
-            ]
-            self.data = pd.DataFrame(data, columns=self.columns).reset_index(drop=True)
+            new_rows = pd.DataFrame(
+                self.make_rows(data.shape[0], nrows),
+                columns=self.columns,
+            ).astype(self.make_dtypes())
+            self.data = pd.concat([data, new_rows], ignore_index=True)
     
     @param.depends('data', watch=True, on_init=True)
     def update_names(self):
         data = cast(pd.DataFrame, self.data)
-        names = data['Material']
-        if self.names is None:
-            self.names = names.to_list()
-        elif len(names) != len(cast(list, self.names)):
-            self.names = names.to_list()
-        elif not (names == self.names).all():
-            self.names = names.to_list()
-        else:
-            return
+        names = data['Material'].to_list()
+        if names != self.names:
+            self.names = names
+
+    @param.depends('names', watch=True, on_init=True)
+    def update_name_tuple(self):
+        """Keep `names` as a tuple for read-only use."""
+        self.name_tuple = tuple(self.names or ())
 
     @property
-    def weight_percent(self):
+    def weight_percent(self) -> pd.DataFrame:
+        if self._weight_percent is None:
+            self._weight_percent = self._calc_weight_percent()
+        return cast(pd.DataFrame, self._weight_percent)
+
+    @property
+    def wt_series(self) -> pd.Series:
+        if self._wt_series is None:
+            self._wt_series = self.weight_percent.set_index('Material')['wt%']
+        return cast(pd.Series, self._wt_series)
+
+    def calc_weight_percent_wt(self) -> pd.DataFrame:
+        return cast(pd.DataFrame, self.data).copy()
+
+    def calc_weight_percent_mM(self) -> pd.DataFrame:
         data = cast(pd.DataFrame, self.data).copy()
-        match self.unit:
-            case 'wt%':
-                return data
-            case 'mM':
-                data['wt%'] = (
-                    data['mM']#mmol/L
-                    .mul(data['g/mol'], axis=0)#mg/L
-                    .div(1000)#g/L
-                ).pipe(
-                    lambda s:
-                        s.div(s.add(1000)).mul(100)
-                )
-                return data
-            case _:
-                raise ValueError(f"`unit` = {self.unit} is not supported.")
+        data['wt%'] = (
+            data['mM']#mmol/L
+            .mul(data['g/mol'], axis=0)#mg/L
+            .div(1000)#g/L
+        ).pipe(
+            lambda s:
+                s.div(s.add(1000)).mul(100)
+        )
+        return data
+
+    def molar_to_weight_percent(self, molar: np.ndarray) -> np.ndarray:
+        """Convert mM of the materials in a mixture into wt%.
+
+        Parameters
+        ----------
+        molar: np.ndarray
+            mM of each material, (rows, materials).
+        """
+        data = cast(pd.DataFrame, self.data)
+        names = cast(list, self.names)
+        molar_mass = data.set_index('Material')['g/mol'].reindex(names)
+        weight = molar * molar_mass.to_numpy(dtype=float) / 1000#g/L
+        return weight / (np.nansum(weight, axis=1, keepdims=True) + 1000) * 100
+
+
+
+def _arrange_columns(data: pd.DataFrame, defaults: dict) -> pd.DataFrame:
+    """Build a table with the columns of `defaults` in that order.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Table whose columns are kept.
+    defaults: dict
+        Column names and the values of columns missing from `data`.
+    """
+    nrows = data.shape[0]
+    return pd.DataFrame({
+        col: data[col].to_numpy() if col in data.columns else np.full(nrows, value)
+        for col, value in defaults.items()
+    })
 
 
 
 class PreMixture(param.Parameterized):
     """Manage Source Materials.
+
+    Set several parameters with `param.update(data=..., nrows=...)`
+    to call each dependent method once.
     
     Attributes
     -----------
@@ -128,6 +241,8 @@ class PreMixture(param.Parameterized):
         Source materials to be used.
     names: list
         Premixture names.
+    name_tuple: tuple
+        `names` as a tuple.
     weight_percent: pd.DataFrame
         `data` in wt%.
     total: str
@@ -137,6 +252,7 @@ class PreMixture(param.Parameterized):
     material = param.ClassSelector(class_=SourceMaterial)
     nrows = param.Integer(default=1, step=1, bounds=(1, None))
     names = param.List(allow_None=True)
+    _weight_percent = param.DataFrame(allow_None=True)
 
     def __init__(
             self,
@@ -152,41 +268,62 @@ class PreMixture(param.Parameterized):
         )
 
     def make_row(self, i) -> list:
+        return self.make_rows(i, i+1)[0]
+
+    def make_rows(self, start: int, stop: int) -> list[list]:
+        """Default rows from `start` to `stop`, sharing the material cells."""
         material = cast(SourceMaterial, self.material)
         data = cast(pd.DataFrame, material.data)
-        row = (
-            [f'{chr(ord("a")+i)}']
-            + [0.]*data.shape[0]
-            + [100]
-        )
-        return row
+        mid = [0.]*data.shape[0]
+        return [[label, *mid, 100] for label in _labels(_LOWER, start, stop)]
+
+    @param.depends(
+        'data', 'material.data', 'material.unit',
+        watch=True, on_init=True)
+    def clear_weight_percent(self):
+        """Discard `weight_percent` calculated from the previous data."""
+        self._weight_percent = None
+
+    @param.depends('material.unit', watch=True, on_init=True)
+    def update_unit(self):
+        """Select how `weight_percent` is calculated for `material.unit`."""
+        material = cast(SourceMaterial, self.material)
+        unit = cast(str, material.unit)
+        match unit:
+            case 'wt%':
+                self._calc_weight_percent = self.calc_weight_percent_wt
+            case 'mM':
+                self._calc_weight_percent = self.calc_weight_percent_mM
+            case _:
+                raise ValueError(f'`material.unit` = {unit} is not supported.')
 
     @param.depends('nrows', watch=True, on_init=False)
     def resize_table(self):
         _data = cast(pd.DataFrame, self.data)
-        data = [
-            _data.iloc[i].to_list() if i<_data.shape[0]
-            else self.make_row(i) for i in range(cast(int, self.nrows))
-        ]
-        self.data = pd.DataFrame(
-            data, columns=_data.columns
-        ).reset_index(drop=True)
+        nrows = cast(int, self.nrows)
+        if nrows <= _data.shape[0]:
+            self.data = _data.iloc[:nrows].reset_index(drop=True)
+        else:
+            new_rows = pd.DataFrame(
+                self.make_rows(_data.shape[0], nrows),
+                columns=_data.columns,
+            )
+            self.data = pd.concat([_data, new_rows], ignore_index=True)
 
     @param.depends('data', watch=True, on_init=True)
     def update_names(self):
         _data = cast(pd.DataFrame, self.data)
         try:
-            names = _data[self._name]
+            names = _data[self._name].to_list()
         except TypeError:
-            names = pd.Series()
-        if self.names is None:
-            self.names = names.to_list()
-        elif len(names) != len(cast(list, self.names)):
-            self.names = names.to_list()
-        elif not (names == self.names).all():
-            self.names = names.to_list()
-        else:
-            return
+            names = []
+        if names != self.names:
+            self.names = names
+
+    @param.depends('names', watch=True, on_init=True)
+    def update_name_tuple(self):
+        """Keep `names` as a tuple for read-only use."""
+        self.name_tuple = tuple(self.names or ())
 
     @param.depends('material.names', watch=True, on_init=True)
     def update_column(self):
@@ -203,7 +340,7 @@ class PreMixture(param.Parameterized):
                 raise ValueError(f"`material.unit` = {unit} is not supported.")
 
         if self.data is None:
-            data = [self.make_row(i) for i in range(cast(int, self.nrows))]
+            data = self.make_rows(0, cast(int, self.nrows))
             columns = (
                 [self._name]
                 + material_data['Material'].to_list()
@@ -211,59 +348,43 @@ class PreMixture(param.Parameterized):
             )
             data = pd.DataFrame(data, columns=columns)
         else:
-            data = (
-                cast(pd.DataFrame, self.data)
-                .copy()
-                .reset_index(drop=True)
-            )
-        value_old = data.drop([self._name], axis=1)
-        name = data[self._name]
-        value_append = pd.DataFrame(
-            {key: [0.]*data.shape[0]
-                for key in material_names if key not in data.columns},
-        )
-        self.data = pd.concat(
-            [name, value_old, value_append],
-            axis=1
-        ).reindex(
-            [self._name]+material_names+[total],
-            axis=1
+            data = cast(pd.DataFrame, self.data)
+        self.data = _arrange_columns(
+            data,
+            {self._name: np.nan}
+            | dict.fromkeys(material_names, 0.)
+            | {total: np.nan}
         )
         self.total = total
 
     @property
-    def weight_percent(self):
+    def weight_percent(self) -> pd.DataFrame:
+        if self._weight_percent is None:
+            self._weight_percent = self._calc_weight_percent()
+        return cast(pd.DataFrame, self._weight_percent)
+
+    def calc_weight_percent_wt(self) -> pd.DataFrame:
+        material = cast(SourceMaterial, self.material)
+        material_names = cast(list, material.names)
+        data = cast(pd.DataFrame, self.data).copy()
+        data['Solvent'] = 100 - np.nansum(
+            data[material_names].to_numpy(dtype=float), axis=1
+        )
+        return data
+
+    def calc_weight_percent_mM(self) -> pd.DataFrame:
         material = cast(SourceMaterial, self.material)
-        unit = cast(str, material.unit)
         material_names = cast(list, material.names)
-        material_data =cast(pd.DataFrame, material.data)
         data = cast(pd.DataFrame, self.data)
-        match unit:
-            case 'wt%':
-                return data.assign(
-                    Solvent=lambda d: 100 - d[material_names].sum(axis=1),
-                )
-            case 'mM':
-                return (
-                    data
-                    .set_index(self._name)
-                    .mul(
-                        material_data.set_index('Material')['g/mol'],
-                        axis=1)#mg/(1000 mL)
-                    .div(1000)#g/(1000 mL)
-                    .pipe(lambda d: d.div(d.sum(axis=1).add(1000)))
-                    .mul(100)#wt%
-                ).assign(
-                    Solvent=lambda d: 100 - d.sum(axis=1),
-                    TotalWeight=(
-                        lambda d:
-                            data['TotalVolume']
-                            + data[material_names].sum(axis=1)
-                    )
-                ).reset_index(
-                )
-            case _:
-                raise ValueError(f'`material.unit` = {unit} is not supported.')
+        molar = data[material_names].to_numpy(dtype=float)
+        percent = material.molar_to_weight_percent(molar)
+        _data = pd.DataFrame(percent, index=data.index, columns=material_names)
+        _data.insert(0, self._name, data[self._name].to_numpy())
+        _data['Solvent'] = 100 - np.nansum(percent, axis=1)
+        _data['TotalWeight'] = (
+            data['TotalVolume'].to_numpy(dtype=float) + np.nansum(molar, axis=1)
+        )
+        return _data
 
 
 
@@ -286,6 +407,8 @@ class Composition(PreMixture):
         Density/(g/cm3) of the solvent.
     names: list
         Composition names.
+    name_tuple: tuple
+        `names` as a tuple.
     weight_percent: pd.DataFrame
         `data` in wt%.
     """
@@ -294,6 +417,8 @@ class Composition(PreMixture):
     premixture = param.ClassSelector(class_=PreMixture, allow_None=True)
     nrows = param.Integer(default=3, step=1, bounds=(1, None))
     names = param.List(allow_None=True)
+    _weight_percent = param.DataFrame(allow_None=True)
+    _any_premix = param.Boolean(default=False)
 
     def __init__(
             self,
@@ -314,18 +439,39 @@ class Composition(PreMixture):
             nrows=nrows, **params
         )
 
+    @param.depends(
+        'data', 'material.data', 'material.unit', 'premixture.names',
+        watch=True, on_init=True)
+    def clear_weight_percent(self):
+        """Discard `weight_percent` calculated from the previous data."""
+        self._weight_percent = None
+
+    @param.depends('data', watch=True, on_init=True)
+    def update_any_premix(self):
+        """Check whether any composition uses premixtures."""
+        data = self.data
+        premixture = cast(PreMixture, self.premixture)
+        premixture_names = cast(list, premixture.names)
+        if data is None or not premixture_names:
+            self._any_premix = False
+            return
+        # `update_column` may not have added the premixture columns yet.
+        self._any_premix = bool(
+            data.reindex(columns=premixture_names, fill_value=False)
+            .to_numpy().any()
+        )
+
     def make_row(self, i) -> list:
+        return self.make_rows(i, i+1)[0]
+
+    def make_rows(self, start: int, stop: int) -> list[list]:
+        """Default rows from `start` to `stop`, sharing the material and premixture cells."""
         material = cast(SourceMaterial, self.material)
         material_names = cast(list, material.names)
         premixture = cast(PreMixture, self.premixture)
         premixture_names = cast(list, premixture.names)
-        row = (
-            [f'{chr(ord("A")+i)}']
-            + [0.]*len(material_names)
-            + [False]*len(premixture_names)
-            + [100]
-        )
-        return row
+        mid = [0.]*len(material_names) + [False]*len(premixture_names)
+        return [[label, *mid, 100] for label in _labels(_UPPER, start, stop)]
 
     @param.depends(
         'material.names', 'premixture.names',
@@ -344,7 +490,7 @@ class Composition(PreMixture):
             case _:
                 raise ValueError(f"`material.unit` = {unit} is not supported.")
         if self.data is None:
-            data = [self.make_row(i) for i in range(cast(int, self.nrows))]
+            data = self.make_rows(0, cast(int, self.nrows))
             columns = (
                 [self._name]
                 + material_names
@@ -353,59 +499,120 @@ class Composition(PreMixture):
             )
             data = pd.DataFrame(data, columns=columns)
         else:
-            data = (
-                cast(pd.DataFrame, self.data)
-                .copy()
-                .reset_index(drop=True)
-            )
-        value_old = data.drop([self._name, total], axis=1)
-        name = data[self._name]
-        weight = data[total]
-        value_append = pd.DataFrame(
-            {key: [0.]*data.shape[0]
-                for key in material_names if key not in data.columns},
-        )
-        bool_append = pd.DataFrame(
-            {key: [False]*data.shape[0]
-                for key in premixture_names if key not in data.columns},
-        )
-        self.data = pd.concat(
-            [name, value_old, value_append, bool_append, weight],
-            axis=1
-        ).reindex(
-            [self._name]+material_names+premixture_names+[total],
-            axis=1
+            data = cast(pd.DataFrame, self.data)
+        self.data = _arrange_columns(
+            data,
+            {self._name: np.nan}
+            | dict.fromkeys(material_names, 0.)
+            | dict.fromkeys(premixture_names, False)
+            | {total: np.nan}
         )
         self.total = total
 
-    @property
-    def weight_percent(self):
-        material = cast(SourceMaterial, self.material)
-        material_data = cast(pd.DataFrame, material.data)
-        unit = cast(str, material.unit)
+    def calc_weight_percent_wt(self) -> pd.DataFrame:
         premixture = cast(PreMixture, self.premixture)
         premixture_names = cast(list, premixture.names)
         data = cast(pd.DataFrame, self.data)
-        match unit:
-            case 'wt%':
-                return data.drop(premixture_names, axis=1)
-            case 'mM':
-                return (
-                    data
-                    .drop(premixture_names, axis=1)
-                    .set_index(self._name)
-                    .mul(
-                        material_data.set_index('Material')['g/mol'],
-                        axis=1)#mg/(1000 mL)
-                    .div(1000)#g/(1000 mL)
-                    .pipe(lambda d: d.div(d.sum(axis=1).add(1000)))
-                    .mul(100)#wt%
-                ).assign(
-                    TotalWeight=lambda d: d['TotalVolume'] + d.sum(axis=1)
-                ).reset_index(
-                )
-            case _:
-                raise ValueError(f"`material.unit` = {unit} is not supported.")
+        return data.drop(premixture_names, axis=1)
+
+    def calc_weight_percent_mM(self) -> pd.DataFrame:
+        material = cast(SourceMaterial, self.material)
+        material_names = cast(list, material.names)
+        data = cast(pd.DataFrame, self.data)
+        percent = material.molar_to_weight_percent(
+            data[material_names].to_numpy(dtype=float)
+        )
+        _data = pd.DataFrame(percent, index=data.index, columns=material_names)
+        _data.insert(0, self._name, data[self._name].to_numpy())
+        _data['TotalWeight'] = (
+            data['TotalVolume'].to_numpy(dtype=float) + np.nansum(percent, axis=1)
+        )
+        return _data
+
+
+
+def _signature(data: Optional[pd.DataFrame]) -> Optional[tuple]:
+    """Summarize the columns and values of a table.
+
+    Tables are often edited in place, so the identity of `data` cannot tell
+    whether it has changed.
+    """
+    if data is None:
+        return None
+    return (
+        tuple(data.columns),
+        pd.util.hash_pandas_object(data).to_numpy().tobytes(),
+    )
+
+
+
+def _scratch(buffers: dict, key: str, shape: tuple) -> np.ndarray:
+    """Return a float array of `shape` kept in `buffers` for reuse."""
+    buffer = buffers.get(key)
+    if buffer is None or buffer.shape != shape:
+        buffer = buffers[key] = np.empty(shape)
+    return buffer
+
+
+
+def _calc_premixture_kernel(
+        weight: np.ndarray,
+        premixture: np.ndarray,
+        selected: np.ndarray,
+        percent: np.ndarray,
+        buffers: Optional[dict] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Weight of materials supplied by premixtures.
+
+    Parameters
+    ----------
+    weight: np.ndarray
+        Weight of each material in each composition, (compositions, materials).
+    premixture: np.ndarray
+        Amount of each material in each premixture, (premixtures, materials).
+    selected: np.ndarray
+        Whether each composition uses each premixture,
+        (compositions, premixtures).
+    percent: np.ndarray
+        wt% of materials and solvent in each premixture,
+        (premixtures, materials+1).
+    buffers: dict, optional
+        Scratch arrays reused between calls.
+
+    Return
+    ------
+    supplied: np.ndarray
+        Weight of materials and solvent supplied by premixtures,
+        (compositions, materials+1).
+    required: np.ndarray
+        Weight of each premixture, (compositions, premixtures).
+    """
+    if buffers is None:
+        buffers = {}
+    n_premixture, n_material = premixture.shape
+    n_composition = weight.shape[0]
+    # How much premixtures are required.
+    factor = np.divide(
+        weight, np.expand_dims(premixture, 1),
+        out=_scratch(buffers, 'factor', (n_premixture, n_composition, n_material))
+    )
+    factor[np.isnan(factor)|(factor==0.)] = 1.
+    factor = factor.min(axis=2, keepdims=True)
+    # Weight by Premixture
+    percent = np.expand_dims(percent, 1)
+    _shape = (n_premixture, n_composition, n_material+1)
+    _premixture = np.multiply(
+        np.expand_dims(selected.T, 2) * factor, percent,
+        out=_scratch(buffers, 'premixture', _shape)
+    )
+    supplied = _premixture.sum(axis=0)
+    # How much premixtures are required.
+    required = _scratch(buffers, 'required', _shape)
+    required.fill(0.)
+    np.divide(_premixture, percent, out=required, where=(percent!=0.))
+    required *= 100
+    required[np.isnan(required)] = 0.
+    return supplied, required.max(axis=2).T
 
 
 
@@ -432,6 +639,8 @@ class Weight(param.Parameterized):
             digit: int = 2,
             **params
         ):
+        self._buffers = {}
+        self._last_inputs = ()
         super().__init__(
             composition=composition, data=data, digit=digit,
             **params
@@ -446,10 +655,19 @@ class Weight(param.Parameterized):
     )
     def update_data(self):
         composition = cast(Composition, self.composition)
-        composition_data = cast(pd.DataFrame, composition.data).copy()
         material = cast(SourceMaterial, composition.material)
-        material_names = cast(list[str], material.names)
         premixture = cast(PreMixture, composition.premixture)
+        # Skip events which leave every input table unchanged.
+        inputs = (
+            _signature(composition.data),
+            _signature(material.data),
+            _signature(premixture.data),
+            self.digit,
+        )
+        if inputs == self._last_inputs:
+            return
+        composition_data = cast(pd.DataFrame, composition.data)
+        material_names = cast(list[str], material.names)
         premixture_names = cast(list[str], premixture.names)
 
         # How weight each materials in the composition.
@@ -464,39 +682,54 @@ class Weight(param.Parameterized):
             # This method can be called before calling self.composition.update_column()
             return
         # How much premixtures are required.
-        if composition_data[premixture_names].to_numpy().any():
+        if composition._any_premix:
             premixture, _premixture = self.calc_premixture(data)
+            premixture = premixture.to_numpy()
         else:
             premixture = 0.
             _premixture = None
         # How much materials are required.
-        data = data.assign(
-            Solvent=(
-                lambda d:
-                    composition_percent
-                    ['TotalWeight']
-                    .sub(d.sum(axis=1), axis=0)
+        total = composition_percent['TotalWeight'].to_numpy(dtype=float)
+        lack = data.to_numpy(dtype=float)
+        lack = np.column_stack([lack, total - np.nansum(lack, axis=1)]) - premixture
+        data = self.calc_source_weight(lack, data.index, material)
+        columns = {'Composition': composition_data['Composition'].to_numpy()}
+        for name in material_names:
+            columns[name] = data[name].to_numpy()
+        for name in premixture_names:
+            columns[name] = (
+                np.full(data.shape[0], np.nan) if _premixture is None
+                else _premixture[name].to_numpy()
             )
-        ).sub(
-            premixture
-        )
-        lack = data.copy()
-        data = data.div(
-            material.weight_percent.set_index('Material')['wt%'],
-            axis=1
-        ).mul(
-            100
-        )
-        data['Solvent'] = lack.sum(axis=1) - data.sum(axis=1)
-        data = data.round(cast(int, self.digit))
-        self.data = pd.concat(
-            [composition_data['Composition'], data, _premixture],
-            axis=1
-        ).reindex(
-            ['Composition']+list(material_names)
-                +list(premixture_names)+['Solvent'],
-            axis=1
-        )
+        columns['Solvent'] = data['Solvent'].to_numpy()
+        self.data = pd.DataFrame(columns)
+        self._last_inputs = inputs
+
+    def calc_source_weight(
+            self,
+            lack: np.ndarray,
+            index: pd.Index,
+            material: SourceMaterial
+        ) -> pd.DataFrame:
+        """Convert the weight of pure materials into source materials.
+
+        Parameters
+        ----------
+        lack: np.ndarray
+            Weight of pure materials followed by solvent,
+            (rows, materials+1).
+        index: pd.Index
+            Index of the resulting table.
+        material: SourceMaterial
+            Source materials to be used.
+        """
+        material_names = cast(list[str], material.names)
+        wt = material.wt_series.reindex(material_names).to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            source = lack[:, :-1] / wt * 100
+        data = pd.DataFrame(source, index=index, columns=material_names)
+        data['Solvent'] = np.nansum(lack, axis=1) - np.nansum(source, axis=1)
+        return data.round(cast(int, self.digit))
 
     def calc_premixture(
             self,
@@ -504,7 +737,6 @@ class Weight(param.Parameterized):
         ) -> tuple[pd.DataFrame, pd.DataFrame]:
         composition = cast(Composition, self.composition)
         composition_data = cast(pd.DataFrame, composition.data)
-        composition_names = cast(list[str], composition.names)
         premixture = cast(PreMixture, composition.premixture)
         premixture_percent = premixture.weight_percent
         premixture_names = cast(list[str], premixture.names)
@@ -512,46 +744,21 @@ class Weight(param.Parameterized):
 
         material = cast(SourceMaterial, composition.material)
         material_names = cast(list[str], material.names)
-        # How much premixtures are required.
-        factor = (
-            data.to_numpy()
-            / np.expand_dims(premixture_data[material_names].to_numpy(), 1)
-        )
-        factor[np.isnan(factor)|(factor==0.)] = 1.
-        _shape = (len(premixture_names), len(composition_names), 1)
-        factor = factor.min(axis=2).reshape(_shape)
-        # Weight by Premixture
-        premixture = (
+        premixture, _premixture = _calc_premixture_kernel(
+            data.to_numpy(),
+            premixture_data[material_names].to_numpy(),
+            composition_data[premixture_names].to_numpy(),
             premixture_percent
-            .drop(['Premixture', 'TotalWeight'], axis=1)
-            .to_numpy()
-            .reshape(len(premixture_names), 1, len(material_names)+1)
-        )
-        _premixture = (
-            composition_data[premixture_names].to_numpy().T.reshape(_shape)
-            * factor
-            * premixture
-        )
-        premixture = _premixture.sum(axis=0)
-        # How much premixtures are required.
-        _premixture = (
-            _premixture
-            / premixture_percent
                 .drop(['Premixture', 'TotalWeight'], axis=1)
-                .to_numpy()
-                .reshape(len(premixture_names), 1, len(material_names)+1)
-            * 100
-        )
-        _premixture[np.isnan(_premixture)] = 0.
-        _premixture = pd.DataFrame(
-            _premixture.max(axis=2).T,
-            columns=premixture_names
+                .to_numpy(dtype=float),
+            self._buffers,
         )
+        _premixture = pd.DataFrame(_premixture, columns=premixture_names)
         premixture = pd.DataFrame(
             premixture,
             columns=material_names+['Solvent']
         )
-        return premixture, _premixture 
+        return premixture, _premixture
 
 
 
@@ -596,36 +803,21 @@ class WeightPremixture(Weight):
         material_names = cast(list[str], material.names)
 
         # How weight each materials in the composition.
-        data = (
-            premixture.weight_percent
-            .pipe(lambda d: d[material_names].mul(d['TotalWeight'], axis=0))
-            .div(100)
+        premixture_percent = premixture.weight_percent
+        total = premixture_percent['TotalWeight'].to_numpy(dtype=float)
+        lack = (
+            premixture_percent[material_names].to_numpy(dtype=float)
+            * np.expand_dims(total, 1)
+            / 100
         )
         # How much materials are required.
-        data = data.assign(
-            Solvent=(
-                lambda d:
-                    premixture.weight_percent
-                    ['TotalWeight']
-                    .sub(d.sum(axis=1), axis=0)
-            )
-        )
-        lack = data.copy()
-        data = data.div(
-            material.weight_percent.set_index('Material')['wt%'],
-            axis=1
-        ).mul(
-            100
-        )
-        data['Solvent'] = lack.sum(axis=1) - data.sum(axis=1)
-        data = data.round(cast(int, self.digit))
-        self.data = pd.concat(
-            [premixture_data[premixture._name], data],
-            axis=1
-        ).reindex(
-            [premixture._name]+list(material_names)+['Solvent'],
-            axis=1
-        )
+        lack = np.column_stack([lack, total - np.nansum(lack, axis=1)])
+        data = self.calc_source_weight(lack, premixture_percent.index, material)
+        columns = {premixture._name: premixture_data[premixture._name].to_numpy()}
+        for name in material_names:
+            columns[name] = data[name].to_numpy()
+        columns['Solvent'] = data['Solvent'].to_numpy()
+        self.data = pd.DataFrame(columns)
     
 
 
@@ -652,9 +844,14 @@ class Work(param.Parameterized):
     @param.depends('weight.data', watch=True, on_init=True)
     def update_data(self):
         weight = cast(Weight, self.weight)
-        data = cast(pd.DataFrame, weight.data).set_index('Composition').copy()
-        data[slice(None)] = np.nan
-        self.data = data.reset_index()
+        weight_data = cast(pd.DataFrame, weight.data)
+        data = pd.DataFrame(
+            np.nan,
+            index=range(weight_data.shape[0]),
+            columns=weight_data.columns.drop('Composition')
+        )
+        data.insert(0, 'Composition', weight_data['Composition'].to_numpy())
+        self.data = data
 
 
 
@@ -682,13 +879,14 @@ class WorkPreMixture(param.Parameterized):
     def update_data(self):
         weight = cast(WeightPremixture, self.weight)
         premixture = cast(PreMixture, weight.premixture)
-        data = (
-            cast(pd.DataFrame, weight.data)
-            .set_index(premixture._name)
-            .copy()
+        weight_data = cast(pd.DataFrame, weight.data)
+        data = pd.DataFrame(
+            np.nan,
+            index=range(weight_data.shape[0]),
+            columns=weight_data.columns.drop(premixture._name)
         )
-        data[slice(None)] = np.nan
-        self.data = data.reset_index()
+        data.insert(0, premixture._name, weight_data[premixture._name].to_numpy())
+        self.data = data
 
 
 
@@ -724,7 +922,7 @@ class ResultPreMixture(param.Parameterized):
         data = (
             data[material.names]
             .mul(
-                material.weight_percent.set_index('Material')['wt%'],
+                material.wt_series,
                 axis=1)
             .div(total, axis=0)
             .reset_index()
@@ -781,29 +979,25 @@ class Result(param.Parameterized):
 
         data = cast(pd.DataFrame, work.data).set_index(composition._name)
         total = data.sum(axis=1)
-        data_premixture = (
-            data[premixture_names]
-            .to_numpy()
-            .T
-            .reshape(len(premixture_names), len(composition_names), 1)
-        ) * (
-            np.expand_dims(res_premixture_data[material_names].to_numpy(), 1)
-        )
-        data_premixture[np.isnan(data_premixture)] = 0.
-        data_premixture = data_premixture.sum(axis=0)
-        data_premixture = pd.DataFrame(
-            data_premixture, columns=material_names,
-            index=cast(list[str], composition.names)
-        ).rename_axis(
-            composition._name
+        # NaN is counted as 0 before summing over premixtures.
+        data_premixture = np.einsum(
+            'cp,pm->cm',
+            np.nan_to_num(data[premixture_names].to_numpy(dtype=float)),
+            np.nan_to_num(res_premixture_data[material_names].to_numpy(dtype=float)),
+            optimize=True,
         )
         data_material = (
-            data[material.names]
-            .mul(
-                material.weight_percent.set_index('Material')['wt%'],
-                axis=1)
-        ).fillna(0.)
-        data = data_premixture.add(data_material).div(total, axis=0).reset_index()
+            data[material_names].to_numpy(dtype=float)
+            * material.wt_series.reindex(material_names).to_numpy(dtype=float)
+        )
+        data_material[np.isnan(data_material)] = 0.
+        # Compositions without logged weight are left as NaN.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data = pd.DataFrame(
+                (data_premixture + data_material)
+                    / np.expand_dims(total.to_numpy(dtype=float), 1),
+                index=data.index, columns=material_names
+            ).reset_index()
         self.data = data
 
 
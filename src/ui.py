@@ -1,4 +1,5 @@
-from typing import cast, Literal, Optional, List
+from functools import lru_cache
+from typing import cast, Literal, Optional
 
 import numpy as np
 import pandas as pd
@@ -6,14 +7,77 @@ import pandas as pd
 import param
 
 import panel as pn
-from bokeh.models.widgets.tables import NumberEditor, StringEditor, CheckboxEditor
-from bokeh.models.widgets.tables import NumberFormatter
 
 from src.logic import SourceMaterial, Composition, Weight, Work, Result
 from src.logic import PreMixture, WeightPremixture, WorkPreMixture, ResultPreMixture
 from src.logic import Process
 
 
+# Tabulator editors given as plain settings instead of Bokeh models, which
+# register callbacks on every table using them and so cannot be shared.
+_NUMBER_EDITOR = {'type': 'number', 'step': 0.01}
+_STRING_EDITOR = 'input'
+_CHECKBOX_EDITOR = 'tickCross'
+_SOURCE_EDITOR = {
+    'Concentration': _NUMBER_EDITOR,
+    'Lot': _STRING_EDITOR,
+}
+_FLOAT_CONFIG = dict(
+    headerControls=dict(
+        close='remove', maximize='remove', minimize='remove'
+    )
+)
+
+
+def _schema(data: pd.DataFrame) -> tuple:
+    """Column names and dtypes, which decide how a table is rendered."""
+    return (tuple(data.columns), tuple(data.dtypes.astype(str)))
+
+
+
+@lru_cache(maxsize=16)
+def _number_formatters(digit: int, columns: tuple[str, ...]) -> dict:
+    """Tabulator formatters showing `columns` with `digit` decimals.
+
+    Parameters
+    ----------
+    digit: int
+        Number of decimals.
+    columns: tuple of str
+        Column names to be formatted.
+    """
+    formatter = {
+        'type': 'money', 'precision': digit, 'thousand': False, 'symbol': ''
+    }
+    return dict.fromkeys(columns, formatter)
+
+
+@lru_cache(maxsize=16)
+def _design_editors(
+        material_names: tuple[str, ...],
+        total: str,
+        name: str,
+        premixture_names: tuple[str, ...] = (),
+    ) -> dict:
+    """Tabulator editors of a premixture or composition table.
+
+    Parameters
+    ----------
+    material_names: tuple of str
+        Material columns, edited as numbers.
+    total: str
+        Total weight or volume column, edited as numbers.
+    name: str
+        Name column, edited as text.
+    premixture_names: tuple of str
+        Premixture columns, edited as checkboxes.
+    """
+    editor = dict.fromkeys(material_names+(total,), _NUMBER_EDITOR)
+    editor[name] = _STRING_EDITOR
+    editor |= dict.fromkeys(premixture_names, _CHECKBOX_EDITOR)
+    return editor
+
+
 
 class FloatingView(pn.viewable.Viewer):
     """Mixin class for (floating) tables.
@@ -28,7 +92,11 @@ class FloatingView(pn.viewable.Viewer):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     """
+    page_size = param.Integer(default=50, bounds=(1, None))
+
     def __init__(
             self,
             title: str = '',
@@ -45,8 +113,29 @@ class FloatingView(pn.viewable.Viewer):
         self.position = position
         self.floating = floating
         self.align = align
+        self._last_schema: Optional[tuple] = None
+        self._last_table: Optional[pn.widgets.Tabulator] = None
         super().__init__(**kwargs)
 
+    def reuse_table(self, schema: tuple) -> Optional[pn.widgets.Tabulator]:
+        """Return the table made last time if it was made for `schema`.
+
+        Tables are linked to the data, so they follow new values by themselves.
+        """
+        if schema == self._last_schema:
+            return self._last_table
+        return None
+
+    def keep_table(
+            self,
+            schema: tuple,
+            table: pn.widgets.Tabulator
+        ) -> pn.widgets.Tabulator:
+        """Remember `table` made for `schema`."""
+        self._last_schema = schema
+        self._last_table = table
+        return table
+
 
 
 class ViewSourceMaterial(FloatingView):
@@ -64,6 +153,8 @@ class ViewSourceMaterial(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: SourceMaterial
         Backend logic.
     """
@@ -72,29 +163,21 @@ class ViewSourceMaterial(FloatingView):
     def __panel__(self):
         parameterized = cast(SourceMaterial, self.data)
         parameter = cast(param.Parameter, parameterized.param.data)
-        editor = {
-            'Concentration': NumberEditor(),
-            'Lot': StringEditor(),
-        }
         nrows = pn.widgets.IntInput.from_param(
             parameterized.param.nrows, start=1, step=1,
             name='N Material'
         )
         table = pn.widgets.Tabulator.from_param(
-            parameter, editors=editor, show_index=False,
+            parameter, editors=_SOURCE_EDITOR, show_index=False,
+            pagination='remote', page_size=self.page_size,
             configuration=dict(clipboard=True), align=self.align
         )
-        float_config = dict(
-            headerControls=dict(
-                close='remove', maximize='remove', minimize='remove'
-            )
-        )
         if self.floating:
             return pn.layout.FloatPanel(
                 nrows, table,
                 name='01. Source Material',
                 margin=5,
-                config=float_config
+                config=_FLOAT_CONFIG
             )
         else:
             return pn.Column(
@@ -118,6 +201,8 @@ class ViewPremixture(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: PreMixture
         Backend logic.
     """
@@ -130,15 +215,10 @@ class ViewPremixture(FloatingView):
         """
         parameterized = cast(PreMixture, self.data)
         material = cast(SourceMaterial, parameterized.material)
-        material_names = cast(list[str], material.names)
-        name = parameterized._name
-        editor = {
-            col: NumberEditor()
-                for col in material_names+[parameterized.total]
-        } | {
-            name: StringEditor()
-        }
-        return editor
+        material_names = cast(tuple[str, ...], material.name_tuple)
+        return _design_editors(
+            material_names, parameterized.total, parameterized._name
+        )
 
     @param.depends('data.data', watch=False)
     def make_table(self):
@@ -146,11 +226,16 @@ class ViewPremixture(FloatingView):
         """
         parameterized = cast(PreMixture, self.data)
         parameter = cast(param.Parameter, parameterized.param.data)
-        editor = self.make_editor()
-        table = pn.widgets.Tabulator.from_param(
-            parameter, editors=editor, show_index=False,
-            configuration=dict(clipboard=True), align=self.align,
-        )
+        data = cast(pd.DataFrame, parameterized.data)
+        schema = _schema(data)
+        table = self.reuse_table(schema)
+        if table is None:
+            editor = self.make_editor()
+            table = self.keep_table(schema, pn.widgets.Tabulator.from_param(
+                parameter, editors=editor, show_index=False,
+                pagination='remote', page_size=self.page_size,
+                configuration=dict(clipboard=True), align=self.align,
+            ))
         return table
 
     def __panel__(self):
@@ -160,15 +245,10 @@ class ViewPremixture(FloatingView):
             parameterized.param.nrows, start=1, step=1,
             name=f'N {name}', align=self.align
         )
-        float_config = dict(
-            headerControls=dict(
-                close='remove', maximize='remove', minimize='remove'
-            )
-        )
         if self.floating:
             return pn.layout.FloatPanel(
                 nrows, self.make_table,
-                name=self.title, margin=20, config=float_config,
+                name=self.title, margin=20, config=_FLOAT_CONFIG,
                 position=self.position, contained=True,
             )
         else: 
@@ -193,6 +273,8 @@ class ViewComposition(ViewPremixture):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: Composition
         Backend logic.
     """
@@ -205,20 +287,13 @@ class ViewComposition(ViewPremixture):
         """
         parameterized = cast(Composition, self.data)
         material = cast(SourceMaterial, parameterized.material)
-        material_names = cast(list[str], material.names)
+        material_names = cast(tuple[str, ...], material.name_tuple)
         premixture = cast(PreMixture, parameterized.premixture)
-        premixture_names = cast(list[str], premixture.names)
-        name = parameterized._name
-        editor = {
-            col: NumberEditor()
-                for col in material_names+[parameterized.total]
-        } | {
-            name: StringEditor()
-        } | {
-            col: CheckboxEditor()
-                for col in premixture_names
-        }
-        return editor
+        premixture_names = cast(tuple[str, ...], premixture.name_tuple)
+        return _design_editors(
+            material_names, parameterized.total, parameterized._name,
+            premixture_names
+        )
 
 
 
@@ -235,6 +310,8 @@ class ViewWeight(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: Weight
         Backend logic.
     """
@@ -251,19 +328,24 @@ class ViewWeight(FloatingView):
         composition = cast(Composition, weight.composition)
         material = cast(SourceMaterial, composition.material)
         premixture = cast(PreMixture, composition.premixture)
-        material_names = cast(list[str], material.names)
-        preixture_names = cast(list[str], premixture.names)
-        formatters = {
-            col: NumberFormatter(format=f'0.{str(0)*digit}')
-            for col in material_names+preixture_names+['Solvent']
-        }
-        editors = {col: None for col in data.columns}
+        material_names = cast(tuple[str, ...], material.name_tuple)
+        preixture_names = cast(tuple[str, ...], premixture.name_tuple)
+        formatters = _number_formatters(
+            digit, material_names+preixture_names+('Solvent',)
+        )
+        schema = _schema(data)
+        table = self.reuse_table(schema)
+        if table is not None:
+            table.formatters = formatters
+            return table
+        editors = dict.fromkeys(data.columns, None)
         table = pn.widgets.Tabulator.from_param(
             parameter, show_index=False,
+            pagination='remote', page_size=self.page_size,
             configuration=dict(clipboard=True),
             formatters=formatters, editors=editors,
         )
-        return table
+        return self.keep_table(schema, table)
 
     def __panel__(self):
         weight = cast(Weight, self.data)
@@ -271,15 +353,10 @@ class ViewWeight(FloatingView):
             weight.param.digit,
             name='N Digit',
         )
-        float_config = dict(
-            headerControls=dict(
-                close='remove', maximize='remove', minimize='remove'
-            )
-        )
         if self.floating:
             return pn.layout.FloatPanel(
                 digit, self.make_table,
-                name=self.title, margin=20, config=float_config,
+                name=self.title, margin=20, config=_FLOAT_CONFIG,
                 position=self.position, contained=True,
             )
         else:
@@ -300,6 +377,8 @@ class ViewWeightPreMixture(ViewWeight):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: WeightPremixture
         Backend logic.
     """
@@ -315,18 +394,23 @@ class ViewWeightPreMixture(ViewWeight):
         data = cast(pd.DataFrame, weight.data)
         premixture = cast(PreMixture, weight.premixture)
         material = cast(SourceMaterial, premixture.material)
-        material_names = cast(list[str], material.names)
-        formatters = {
-            col: NumberFormatter(format=f'0.{str(0)*digit}')
-            for col in material_names+['Solvent']
-        }
-        editors = {col: None for col in data.columns}
+        material_names = cast(tuple[str, ...], material.name_tuple)
+        formatters = _number_formatters(
+            digit, material_names+('Solvent',)
+        )
+        schema = _schema(data)
+        table = self.reuse_table(schema)
+        if table is not None:
+            table.formatters = formatters
+            return table
+        editors = dict.fromkeys(data.columns, None)
         table = pn.widgets.Tabulator.from_param(
             parameter, show_index=False,
+            pagination='remote', page_size=self.page_size,
             configuration=dict(clipboard=True),
             formatters=formatters, editors=editors,
         )
-        return table
+        return self.keep_table(schema, table)
 
 
 
@@ -343,6 +427,8 @@ class ViewWork(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: Work
         Backend logic.
     threshold: float
@@ -350,45 +436,70 @@ class ViewWork(FloatingView):
     """
     data = param.ClassSelector(class_=Work)
     threshold = param.Number(default=0.01)
+    _targets = param.Dict(default={})
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._threshold_widget = pn.widgets.NumberInput(
+            value=self.threshold, name='Validation'
+        )
+        # Recolor once the spinner is released instead of on every step,
+        # while the widget still shows values set from code. Both watchers
+        # are made once here so that re-rendering does not stack them.
+        self._threshold_widget.param.watch(
+            lambda event: setattr(self, 'threshold', event.new),
+            'value_throttled'
+        )
+        self.param.watch(
+            lambda event: setattr(self._threshold_widget, 'value', event.new),
+            'threshold'
+        )
 
-    def validate(self, value, target):
-        """Check the weighted value is acceptable or not.
+    @param.depends('data.data', watch=True, on_init=True)
+    def update_targets(self):
+        """Keep the designed amount of each numeric column as an array."""
+        work = cast(Work, self.data)
+        weight = cast(Weight, work.weight)
+        weight_data = cast(pd.DataFrame, weight.data)
+        self._targets = {
+            col: weight_data[col].to_numpy(dtype=float)
+                for col in weight_data.columns
+                if weight_data[col].dtype.kind in 'biuf'
+        }
+
+    def _color_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Yield color setting for each cells.
         
+        Colors are decided baising on acceptable error or not.
+
         Parameters
         ----------
-        value: float
+        data: pd.DataFrame
             Weighted amount.
-        target: float
-            Designed amount.
-        
+
         Return
         ------
-        res: str
+        color: pd.DataFrame
             Acceptable -> "blue"
             Fail -> "red"
-            Empty cell -> "black"
-        """
-        try:
-            res = abs(value/target - 1) < self.threshold
-            res = 'blue' if res else 'red'
-        except ZeroDivisionError:
-            res = 'blue' if np.isnan(value) else 'red'
-        except TypeError:
-            res = 'black'
-        return res
-
-    def coloring(self, s):
-        """Yield color setting for each cells.
-        
-        Colors are decided baising on acceptable error or not.
+            Text cell -> "black"
+            An empty cell is acceptable only when the designed amount is 0.
         """
-        work = cast(Work, self.data)
-        weight = cast(Weight, work.weight)
-        weight_data = cast(pd.DataFrame, weight.data)
-        color = [
-            f'color: {self.validate(value, target)}'
-            for value, target in zip(s, weight_data[s.name])
+        targets = cast(dict, self._targets)
+        color = pd.DataFrame('color: black', index=data.index, columns=data.columns)
+        # Names and other text cannot be validated.
+        numeric = [
+            col for col in data.columns
+            if col in targets and data[col].dtype.kind in 'biuf'
         ]
+        if not numeric:
+            return color
+        value = data[numeric].to_numpy(dtype=float)
+        target = np.column_stack([targets[col] for col in numeric])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            accept = np.abs(value/target - 1) < self.threshold
+        accept = np.where(target == 0, np.isnan(value), accept)
+        color[numeric] = np.where(accept, 'color: blue', 'color: red')
         return color
 
     @param.depends('data.data', 'threshold', watch=False)
@@ -398,30 +509,28 @@ class ViewWork(FloatingView):
         work = cast(Work, self.data)
         work_data = cast(pd.DataFrame, work.data)
         parameter = work.param.data
-        editor = {
-            col: NumberEditor()
-                for col in work_data.columns if col != 'Composition'
-        }
+        # Colors are recomputed for new values but not for a new threshold.
+        schema = (*_schema(work_data), self.threshold)
+        table = self.reuse_table(schema)
+        if table is not None:
+            return table
+        editor = dict.fromkeys(
+            work_data.columns.drop('Composition'), _NUMBER_EDITOR
+        )
         table = pn.widgets.Tabulator.from_param(
             parameter, editors=editor, show_index=False,
+            pagination='remote', page_size=self.page_size,
             configuration=dict(placeholder='empty'),
         )
-        cast(pd.DataFrame, table).style.apply(self.coloring)
-        return table
+        cast(pd.DataFrame, table).style.apply(self._color_frame, axis=None)
+        return self.keep_table(schema, table)
 
     def __panel__(self):
-        threshold = pn.widgets.NumberInput.from_param(
-            self.param.threshold, name='Validation'
-        )
-        float_config = dict(
-            headerControls=dict(
-                close='remove', maximize='remove', minimize='remove'
-            )
-        )
+        threshold = self._threshold_widget
         if self.floating:
             return pn.layout.FloatPanel(
                 threshold, self.make_table,
-                name=self.title, margin=20, config=float_config,
+                name=self.title, margin=20, config=_FLOAT_CONFIG,
                 position=self.position, contained=True,
             )
         else:
@@ -442,6 +551,8 @@ class ViewWorkPreMixture(ViewWork):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: WorkPreMixture
         Backend logic.
     threshold: float
@@ -457,16 +568,21 @@ class ViewWorkPreMixture(ViewWork):
         work = cast(Work, self.data)
         work_data = cast(pd.DataFrame, work.data)
         parameter = work.param.data
-        editor = {
-            col: NumberEditor()
-                for col in work_data.columns if col != 'Premixture'
-        }
+        # Colors are recomputed for new values but not for a new threshold.
+        schema = (*_schema(work_data), self.threshold)
+        table = self.reuse_table(schema)
+        if table is not None:
+            return table
+        editor = dict.fromkeys(
+            work_data.columns.drop('Premixture'), _NUMBER_EDITOR
+        )
         table = pn.widgets.Tabulator.from_param(
             parameter, editors=editor, show_index=False,
+            pagination='remote', page_size=self.page_size,
             configuration=dict(placeholder='empty'),
         )
-        cast(pd.DataFrame, table).style.apply(self.coloring)
-        return table
+        cast(pd.DataFrame, table).style.apply(self._color_frame, axis=None)
+        return self.keep_table(schema, table)
 
 
 
@@ -483,6 +599,8 @@ class ViewResult(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: Result
         Backend logic.
     """
@@ -495,22 +613,21 @@ class ViewResult(FloatingView):
         result = cast(Result, self.data)
         data = cast(param.Parameter, result.param.data)
         result_data = cast(pd.DataFrame, result.data)
-        editor = {key: None for key in result_data.columns}
-        table = pn.widgets.Tabulator.from_param(
-            data, editors=editor, show_index=False,
-        )
+        schema = _schema(result_data)
+        table = self.reuse_table(schema)
+        if table is None:
+            editor = dict.fromkeys(result_data.columns, None)
+            table = self.keep_table(schema, pn.widgets.Tabulator.from_param(
+                data, editors=editor, show_index=False,
+                pagination='remote', page_size=self.page_size,
+            ))
         return table
 
     def __panel__(self):
-        float_config = dict(
-            headerControls=dict(
-                close='remove', maximize='remove', minimize='remove'
-            )
-        )
         if self.floating:
             return pn.layout.FloatPanel(
                 self.make_table,
-                name=self.title, margin=20, config=float_config,
+                name=self.title, margin=20, config=_FLOAT_CONFIG,
                 position=self.position, contained=True,
             )
         else:
@@ -531,6 +648,8 @@ class ViewResultPreMixture(ViewResult):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: ResultPreMixture
         Backend logic.
     """
@@ -551,6 +670,8 @@ class ViewProcess(FloatingView):
         Whether floating is enabled or not.
     align: str
         How to align contents.
+    page_size: int
+        Number of rows in each page of the table.
     data: Process
         Backend logic.
     """
@@ -564,10 +685,11 @@ class ViewProcess(FloatingView):
         weight = cast(Weight, process.weight)
         composition = cast(Composition, weight.composition)
         material = cast(SourceMaterial, composition.material)
-        names = cast(List, material.names)
-        editor = {key: NumberEditor() for key in names}
+        names = cast(tuple[str, ...], material.name_tuple)
+        editor = dict.fromkeys(names, _NUMBER_EDITOR)
         table = pn.widgets.Tabulator.from_param(
             process.param.data, editors=editor, show_index=True,
+            pagination='remote', page_size=self.page_size,
         )
         return table
 